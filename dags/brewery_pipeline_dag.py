@@ -1,12 +1,49 @@
 import os
+import sys
+from pathlib import Path
 
 import pendulum
 from airflow.decorators import dag, task
 
+
+def _record_task_span(context) -> None:
+    """Writes an OTLP/JSON span per task when OBDB_TRACE_PATH is set."""
+    project_dir = os.getenv(
+        "OBDB_PROJECT_DIR", str(Path(__file__).resolve().parent.parent)
+    )
+    if project_dir not in sys.path:
+        sys.path.insert(0, project_dir)
+    from extract.config import load_settings
+    from extract.observability import record_span
+
+    trace_path = load_settings().trace_path
+    if trace_path is None:
+        return
+
+    ti = context["ti"]
+    end = ti.end_date or pendulum.now("UTC")
+    record_span(
+        trace_path,
+        name=ti.task_id,
+        trace_key=context["run_id"],
+        start=ti.start_date or end,
+        end=end,
+        status="error" if context.get("exception") else "ok",
+        attributes={
+            "dag_id": ti.dag_id,
+            "run_id": context["run_id"],
+            "try_number": ti.try_number,
+        },
+    )
+
+
 default_args = {
     "owner": "chris@openbrewerydb.org",
     "retries": 2,
     "retry_delay": pendulum.duration(minutes=1),
+    "on_success_callback": _record_task_span,
+    "on_failure_callback": _record_task_span,
+    "on_retry_callback": _record_task_span,
 }
 
 
@@ -30,9 +67,29 @@ def brewery_pipeline():
         "OBDB_DBT_PROJECT_DIR", f"{project_dir}/dbt_project/brewery_models"
     )
     venv_python = os.getenv("OBDB_VENV_PYTHON", f"{project_dir}/.venv/bin/python")
+    dbt_threads = os.getenv("OBDB_DBT_THREADS", "4")
 
     bash_opts = "set -euo pipefail"
 
+    def dbt_run_command(stage: str, selector: str) -> str:
+        # Later dbt invocations overwrite target/run_results.json, so keep a
+        # per-stage copy for export_metrics without masking dbt's exit status.
+        return (
+            f"{bash_opts}\n"
+            "rm -f target/run_results.json\n"
+            "status=0\n"
+            f"dbt run --threads {dbt_threads} {selector} || status=$?\n"
+            "if [ -f target/run_results.json ]; then\n"
+            f"  cp target/run_results.json target/run_results_{stage}.json\n"
+            "fi\n"
+            "exit $status"
+        )
+
+    @task.bash(cwd=dbt_project_dir)
+    def clear_dbt_stage_results() -> str:
+        """Removes the previous run's per-stage dbt results so none go stale."""
+        return f"{bash_opts}\nrm -f target/run_results_*.json"
+
     @task.bash(cwd=project_dir)
     def load_obdb_data() -> str:
         """Runs the Python script to load raw data."""
@@ -43,22 +100,59 @@ def brewery_pipeline():
         """Runs the Python script to load raw JSON data."""
         return f"{bash_opts}\n{venv_python} ./extract/load_ba_json_data.py"
 
+    @task.bash(cwd=dbt_project_dir)
+    def dbt_run_base() -> str:
+        """Runs the staging/dim models that feed partitioned matching."""
+        return dbt_run_command("base", "--exclude tag:partitioned")
+
+    @task.bash(cwd=project_dir)
+    def match_partitions() -> str:
+        """Matches and combines breweries per state_province partition."""
+        return f"{bash_opts}\n{venv_python} -m extract.cli match"
+
     @task.bash(cwd=dbt_project_dir)
     def dbt_run() -> str:
-        """Runs the dbt models."""
-        return f"{bash_opts}\ndbt run"
+        """Runs the dbt models exposing the partitioned outputs."""
+        return dbt_run_command("partitioned", "--select tag:partitioned")
 
     @task.bash(cwd=dbt_project_dir)
     def dbt_test() -> str:
         """Runs the dbt tests after the models are built."""
-        return f"{bash_opts}\ndbt test"
+        return f"{bash_opts}\ndbt test --threads {dbt_threads}"
 
+    @task.bash(cwd=project_dir)
+    def publish_snapshot() -> str:
+        """Publishes the tested DuckDB file as a read-only snapshot."""
+        return f"{bash_opts}\n{venv_python} -m extract.cli publish"
+
+    @task.bash(cwd=project_dir)
+    def export_metrics() -> str:
+        """Writes the OpenMetrics textfile, even when upstream tasks failed."""
+        return f"{bash_opts}\n{venv_python} -m extract.cli metrics"
+
+    clear_task = clear_dbt_stage_results()
     load_obdb_task = load_obdb_data()
     load_ba_task = load_ba_data()
+    run_base_task = dbt_run_base()
+    match_task = match_partitions()
     run_task = dbt_run()
     test_task = dbt_test()
+    publish_task = publish_snapshot()
+    metrics_task = export_metrics()
 
-    [load_obdb_task, load_ba_task] >> run_task >> test_task
+    # export_metrics is a teardown: it runs whenever the setup succeeded,
+    # even after upstream failures, but is left out of the DAG run state, so
+    # a failed load or dbt test still fails the run.
+    (
+        clear_task
+        >> [load_obdb_task, load_ba_task]
+        >> run_base_task
+        >> match_task
+        >> run_task
+        >> test_task
+        >> publish_task
+        >> metrics_task.as_teardown(setups=clear_task)
+    )
 
 
 brewery_pipeline()
@@ -1,13 +1,24 @@
 import argparse
 import json
+import time
 from typing import Any
 
-from extract import load_ba_json_data, load_obdb_csv_data
+from extract import load_ba_json_data, load_obdb_csv_data, matching
 from extract.config import load_settings
 from extract.duckdb_utils import fetch_ingest_runs
+from extract.ingest_log import fetch_recent_ingest_runs
+from extract.metrics import collect_metrics, serve_metrics, write_textfile
+from extract.snapshots import current_snapshot, publish_snapshot
 
 
-def run(action: str, limit: int = 10) -> None:
+def run(
+    action: str,
+    limit: int = 10,
+    parallelism: int | None = None,
+    full_refresh: bool = False,
+    serve_port: int | None = None,
+    snapshot: bool = False,
+) -> None:
     if action == "obdb":
         load_obdb_csv_data.main()
     elif action == "ba":
@@ -15,13 +26,48 @@ def run(action: str, limit: int = 10) -> None:
     elif action == "all":
         load_obdb_csv_data.main()
         load_ba_json_data.main()
+    elif action == "match":
+        matching.main(parallelism=parallelism, full_refresh=full_refresh)
     elif action == "ingest-runs":
         settings = load_settings()
-        rows: list[dict[str, Any]] = fetch_ingest_runs(settings.db_path, limit=limit)
+        rows: list[dict[str, Any]]
+        # Never open the working DB: even a read-only connection blocks writers
+        if not snapshot and settings.ingest_log_path.exists():
+            rows = fetch_recent_ingest_runs(settings.ingest_log_path, limit=limit)
+        else:
+            read_path = current_snapshot(settings.snapshot_dir)
+            if read_path is None:
+                if snapshot:
+                    raise SystemExit(
+                        f"❌ No published snapshot in {settings.snapshot_dir}; "
+                        "run `python -m extract.cli publish` first."
+                    )
+                rows = []
+            else:
+                rows = fetch_ingest_runs(read_path, limit=limit)
         if not rows:
             print("No ingest_runs records found.")
             return
         print(json.dumps(rows, indent=2, default=str))
+    elif action == "publish":
+        settings = load_settings()
+        published = publish_snapshot(
+            settings.db_path, settings.snapshot_dir, retain=settings.snapshot_retain
+        )
+        print(f"📸 Published snapshot {published}")
+    elif action == "metrics":
+        settings = load_settings()
+        if serve_port is None:
+            path = write_textfile(collect_metrics(settings), settings.metrics_textfile)
+            print(f"📈 Wrote metrics to {path}")
+            return
+        server = serve_metrics(lambda: collect_metrics(settings), port=serve_port)
+        print(f"📈 Serving metrics on http://127.0.0.1:{server.server_port}/metrics")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
     else:
         raise ValueError(f"Unknown action: {action}")
 
@@ -30,8 +76,11 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="Run OBDB ETL loaders")
     parser.add_argument(
         "action",
-        choices=["obdb", "ba", "all", "ingest-runs"],
-        help="Which loader to run or inspect ingest history",
+        choices=["obdb", "ba", "all", "match", "ingest-runs", "publish", "metrics"],
+        help=(
+            "Which loader to run, partitioned matching, inspect ingest history, "
+            "publish a snapshot, or export metrics"
+        ),
     )
     parser.add_argument(
         "--limit",
@@ -39,8 +88,38 @@ def main() -> None:
         default=10,
         help="Number of ingest_runs records to show (ingest-runs only)",
     )
+    parser.add_argument(
+        "--parallelism",
+        type=int,
+        default=None,
+        help="Concurrent state_province partitions (match only)",
+    )
+    parser.add_argument(
+        "--full-refresh",
+        action="store_true",
+        help="Recompute every partition (match only)",
+    )
+    parser.add_argument(
+        "--serve",
+        type=int,
+        default=None,
+        metavar="PORT",
+        help="Serve OpenMetrics on PORT instead of writing the textfile (metrics only)",
+    )
+    parser.add_argument(
+        "--snapshot",
+        action="store_true",
+        help="Read the published snapshot instead of the ingest log (ingest-runs only)",
+    )
     args = parser.parse_args()
-    run(args.action, limit=args.limit)
+    run(
+        args.action,
+        limit=args.limit,
+        parallelism=args.parallelism,
+        full_refresh=args.full_refresh,
+        serve_port=args.serve,
+        snapshot=args.snapshot,
+    )
 
 
 if __name__ == "__main__":
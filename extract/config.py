@@ -11,6 +11,16 @@ def _path_env(name: str, default: Path) -> Path:
     return Path(value).expanduser() if value else default
 
 
+def _optional_path_env(name: str) -> Path | None:
+    value = os.getenv(name)
+    return Path(value).expanduser() if value else None
+
+
+def _int_env(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
 @dataclass(frozen=True)
 class Settings:
     db_path: Path
@@ -19,6 +29,13 @@ class Settings:
     ba_local_json_path: Path
     obdb_table: str
     ba_table: str
+    snapshot_dir: Path
+    ingest_log_path: Path
+    snapshot_retain: int
+    match_parallelism: int
+    dbt_project_dir: Path
+    metrics_textfile: Path
+    trace_path: Path | None
 
 
 def load_settings() -> Settings:
@@ -32,10 +49,24 @@ def load_settings() -> Settings:
       - BA_JSON_LOCAL_PATH: override local cache path for BA JSON
       - OBDB_TABLE: override table name for OBDB CSV
       - BA_TABLE: override table name for BA JSON
+      - OBDB_SNAPSHOT_DIR: directory for published read-only snapshots
+        (default: data/snapshots)
+      - OBDB_INGEST_LOG_PATH: SQLite side log of ingest runs that readers
+        query instead of the working DB (default: ingest_runs.sqlite next
+        to the DuckDB file)
+      - OBDB_SNAPSHOT_RETAIN: number of published snapshots to keep
+        (default: 3, minimum: 2)
+      - OBDB_MATCH_PARALLELISM: concurrent state_province partitions when
+        matching (default: 4)
+      - OBDB_DBT_PROJECT_DIR: dbt project holding sources.yml and target/
+        (default: dbt_project/brewery_models)
+      - OBDB_METRICS_TEXTFILE: OpenMetrics textfile output
+        (default: data/metrics/obdb.prom)
+      - OBDB_TRACE_PATH: append OTLP/JSON task spans here (default: disabled)
     """
-    db_path_default = PROJECT_ROOT / "data" / "obdb.duckdb"
+    db_path = _path_env("OBDB_DUCKDB_PATH", PROJECT_ROOT / "data" / "obdb.duckdb")
     return Settings(
-        db_path=_path_env("OBDB_DUCKDB_PATH", db_path_default),
+        db_path=db_path,
         obdb_csv_url=os.getenv(
             "OBDB_CSV_URL",
             "https://raw.githubusercontent.com/openbrewerydb/openbrewerydb/master/breweries.csv",
@@ -49,6 +80,21 @@ def load_settings() -> Settings:
         ),
         obdb_table=os.getenv("OBDB_TABLE", "raw_obdb_breweries"),
         ba_table=os.getenv("BA_TABLE", "raw_ba_json_data"),
+        snapshot_dir=_path_env(
+            "OBDB_SNAPSHOT_DIR", PROJECT_ROOT / "data" / "snapshots"
+        ),
+        ingest_log_path=_path_env(
+            "OBDB_INGEST_LOG_PATH", db_path.parent / "ingest_runs.sqlite"
+        ),
+        snapshot_retain=_int_env("OBDB_SNAPSHOT_RETAIN", 3),
+        match_parallelism=_int_env("OBDB_MATCH_PARALLELISM", 4),
+        dbt_project_dir=_path_env(
+            "OBDB_DBT_PROJECT_DIR", PROJECT_ROOT / "dbt_project" / "brewery_models"
+        ),
+        metrics_textfile=_path_env(
+            "OBDB_METRICS_TEXTFILE", PROJECT_ROOT / "data" / "metrics" / "obdb.prom"
+        ),
+        trace_path=_optional_path_env("OBDB_TRACE_PATH"),
     )
 
 
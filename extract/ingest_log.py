@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Mapping
+
+INGEST_LOG_COLUMNS = (
+    "ts",
+    "source",
+    "table_name",
+    "row_count",
+    "status",
+    "note",
+    "metrics_json",
+    "duration_seconds",
+)
+
+
+def _connect(path: str | Path) -> sqlite3.Connection:
+    con = sqlite3.connect(Path(path), timeout=30)
+    con.row_factory = sqlite3.Row
+    return con
+
+
+def append_ingest_run(path: str | Path, row: Mapping[str, Any]) -> None:
+    """
+    Append one ingest run to the SQLite side log.
+
+    The log lives outside the working DuckDB file so readers (`ingest-runs`,
+    metrics scrapes) never take a lock that would block loaders or dbt.
+    WAL mode lets those readers run while a writer appends.
+    """
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with closing(_connect(target)) as con:
+        con.execute("PRAGMA journal_mode=WAL")
+        with con:
+            con.execute(
+                """
+                CREATE TABLE IF NOT EXISTS ingest_runs (
+                    ts TEXT,
+                    source TEXT,
+                    table_name TEXT,
+                    row_count INTEGER,
+                    status TEXT,
+                    note TEXT,
+                    metrics_json TEXT,
+                    duration_seconds REAL
+                )
+                """
+            )
+            # Serve the per-source lookups below without scanning the log
+            con.execute(
+                "CREATE INDEX IF NOT EXISTS ingest_runs_source_ts "
+                "ON ingest_runs (source, ts)"
+            )
+            con.execute(
+                "CREATE INDEX IF NOT EXISTS ingest_runs_source_status_ts "
+                "ON ingest_runs (source, table_name, status, ts)"
+            )
+            con.execute(
+                f"""
+                INSERT INTO ingest_runs ({", ".join(INGEST_LOG_COLUMNS)})
+                VALUES ({", ".join("?" for _ in INGEST_LOG_COLUMNS)})
+                """,
+                [row.get(column) for column in INGEST_LOG_COLUMNS],
+            )
+
+
+def _query(path: str | Path, sql: str, params: tuple = ()) -> list[dict[str, Any]]:
+    # ts is a fixed-width UTC ISO string, so text order is time order
+    if not Path(path).exists():
+        return []
+    with closing(_connect(path)) as con:
+        exists = con.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ingest_runs'"
+        ).fetchone()
+        if exists is None:
+            return []
+        return [dict(row) for row in con.execute(sql, params)]
+
+
+def fetch_recent_ingest_runs(path: str | Path, limit: int = 20) -> list[dict[str, Any]]:
+    """
+    Return the newest ingest runs from the side log, newest first.
+    """
+    return _query(
+        path,
+        f"""
+        SELECT {", ".join(INGEST_LOG_COLUMNS)}
+        FROM ingest_runs
+        ORDER BY ts DESC, rowid DESC
+        LIMIT ?
+        """,
+        (max(1, int(limit)),),
+    )
+
+
+def fetch_latest_ingest_runs(path: str | Path) -> list[dict[str, Any]]:
+    """
+    Return the most recent run of each source, whatever its status.
+    """
+    return _query(
+        path,
+        f"""
+        SELECT {", ".join(INGEST_LOG_COLUMNS)}
+        FROM ingest_runs
+        WHERE rowid IN (
+            SELECT (
+                SELECT rowid
+                FROM ingest_runs AS runs
+                WHERE runs.source = sources.source
+                ORDER BY ts DESC, rowid DESC
+                LIMIT 1
+            )
+            FROM (SELECT DISTINCT source FROM ingest_runs) AS sources
+        )
+        """,
+    )
+
+
+def fetch_last_successes(path: str | Path) -> list[dict[str, Any]]:
+    """
+    Return the latest successful run time per source and table, however
+    many failed runs have been logged since.
+    """
+    return _query(
+        path,
+        """
+        SELECT *
+        FROM (
+            SELECT
+                source,
+                table_name,
+                (
+                    SELECT max(ts)
+                    FROM ingest_runs AS runs
+                    WHERE runs.source = pairs.source
+                      AND runs.table_name IS pairs.table_name
+                      AND runs.status = 'success'
+                ) AS ts
+            FROM (SELECT DISTINCT source, table_name FROM ingest_runs) AS pairs
+        )
+        WHERE ts IS NOT NULL
+        """,
+    )
+
+
+__all__ = [
+    "INGEST_LOG_COLUMNS",
+    "append_ingest_run",
+    "fetch_recent_ingest_runs",
+    "fetch_latest_ingest_runs",
+    "fetch_last_successes",
+]
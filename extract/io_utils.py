@@ -4,10 +4,14 @@ import urllib.error
 import urllib.request
 from datetime import datetime, timezone
 from io import BytesIO
+from pathlib import Path
 from typing import Iterable, Mapping, Sequence
 
 import pandas as pd
 
+from extract.ingest_log import append_ingest_run
+from extract.observability import log_event, record_fetch
+
 DEFAULT_TIMEOUT = 15
 
 
@@ -21,9 +25,12 @@ def fetch_bytes(
     attempt = 0
     while True:
         try:
+            started = time.monotonic()
             req = urllib.request.Request(url, headers={"User-Agent": "obdb-etl/1.0"})
             with urllib.request.urlopen(req, timeout=timeout) as resp:
-                return resp.read()
+                data = resp.read()
+            record_fetch(url, len(data), time.monotonic() - started)
+            return data
         except (urllib.error.URLError, TimeoutError):
             attempt += 1
             if attempt > retries:
@@ -95,7 +102,14 @@ def log_ingest_run(
     note: str | None = None,
     metrics: Mapping[str, object] | None = None,
     duration_seconds: float | None = None,
+    ingest_log_path: str | Path | None = None,
 ) -> None:
+    """
+    Record a run in the DB's ingest_runs table and, when `ingest_log_path`
+    is given, in the side log that readers use instead of the working DB.
+    """
+    ts = datetime.now(timezone.utc)
+    metrics_json = json.dumps(metrics) if metrics else None
     con.execute(
         """
         CREATE TABLE IF NOT EXISTS ingest_runs (
@@ -113,13 +127,37 @@ def log_ingest_run(
     con.execute(
         "INSERT INTO ingest_runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
         (
-            datetime.now(timezone.utc),
+            ts,
             source,
             table_name,
             row_count,
             status,
             note,
-            json.dumps(metrics) if metrics else None,
+            metrics_json,
             duration_seconds,
         ),
     )
+    if ingest_log_path is not None:
+        append_ingest_run(
+            ingest_log_path,
+            {
+                "ts": ts.isoformat(timespec="microseconds"),
+                "source": source,
+                "table_name": table_name,
+                "row_count": row_count,
+                "status": status,
+                "note": note,
+                "metrics_json": metrics_json,
+                "duration_seconds": duration_seconds,
+            },
+        )
+    log_event(
+        "ingest_run",
+        source=source,
+        table_name=table_name,
+        row_count=row_count,
+        status=status,
+        note=note,
+        duration_seconds=duration_seconds,
+        metrics=dict(metrics) if metrics else None,
+    )
@@ -4,6 +4,7 @@ import duckdb
 import pandas as pd
 from extract.config import load_settings
 from extract.duckdb_utils import write_df_to_duckdb
+from extract.observability import fetched_bytes
 from extract.io_utils import (
     ensure_non_empty,
     load_json_from_url,
@@ -18,6 +19,9 @@ def main():
     """
     settings = load_settings()
     started = time.monotonic()
+    # The registry is process-wide (`cli all` runs both loaders), so report
+    # only the bytes fetched by this run.
+    bytes_before = fetched_bytes()
     db_path = settings.db_path
     data_url = settings.ba_json_url
     local_json_path = settings.ba_local_json_path
@@ -96,8 +100,12 @@ def main():
                 row_count,
                 "success",
                 None,
-                metrics={"row_count": row_count},
+                metrics={
+                    "row_count": row_count,
+                    "bytes_fetched": int(fetched_bytes() - bytes_before),
+                },
                 duration_seconds=duration,
+                ingest_log_path=settings.ingest_log_path,
             )
         print("--- ETL process finished ---")
     except Exception as exc:
@@ -113,6 +121,7 @@ def main():
                     "failed",
                     note=str(exc),
                     duration_seconds=duration,
+                    ingest_log_path=settings.ingest_log_path,
                 )
         finally:
             raise
@@ -10,6 +10,7 @@ from extract.io_utils import (
     summarize_null_rates,
 )
 from extract.duckdb_utils import write_df_to_duckdb
+from extract.observability import fetched_bytes
 
 
 def main():
@@ -19,6 +20,9 @@ def main():
     """
     settings = load_settings()
     started = time.monotonic()
+    # The registry is process-wide (`cli all` runs both loaders), so report
+    # only the bytes fetched by this run.
+    bytes_before = fetched_bytes()
     db_path = settings.db_path
     data_url = settings.obdb_csv_url
     table_name = settings.obdb_table
@@ -64,6 +68,7 @@ def main():
         duration = time.monotonic() - started
         metrics = {
             "row_count": row_count,
+            "bytes_fetched": int(fetched_bytes() - bytes_before),
             **summarize_null_rates(df, ["latitude", "longitude"]),
         }
         with duckdb.connect(database=str(db_path), read_only=False) as con:
@@ -76,6 +81,7 @@ def main():
                 None,
                 metrics=metrics,
                 duration_seconds=duration,
+                ingest_log_path=settings.ingest_log_path,
             )
         print("--- ETL process finished ---")
     except Exception as exc:
@@ -91,6 +97,7 @@ def main():
                     "failed",
                     note=str(exc),
                     duration_seconds=duration,
+                    ingest_log_path=settings.ingest_log_path,
                 )
         finally:
             raise
@@ -0,0 +1,817 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import duckdb
+from pandas import DataFrame
+
+from extract.config import load_settings
+from extract.io_utils import log_ingest_run
+
+# Bump when the matching/combine SQL changes so every partition is rebuilt
+# and cached pair decisions are discarded.
+MATCHING_RULES_VERSION = "1"
+
+OBDB_MODEL = "dim_breweries"
+BA_MODEL = "stg_ba_breweries"
+MATCHES_TABLE = "partitioned_brewery_matches"
+COMBINED_TABLE = "partitioned_breweries_combined"
+PARTITION_STATE_TABLE = "match_partition_state"
+CACHE_TABLE = "match_cache"
+CACHE_RECORDS_TABLE = "match_cache_records"
+
+MATCH_COLUMNS = ["partition_key", "brewery_id", "ba_brewery_id", "match_strategy"]
+
+PARTITION_KEY_SQL = "LOWER(TRIM(COALESCE(state_province, '')))"
+
+PARTITION_FINGERPRINTS_SQL = f"""
+WITH obdb AS (
+  SELECT
+    {PARTITION_KEY_SQL} AS partition_key,
+    COUNT(*) AS obdb_rows,
+    md5(string_agg(CAST(t AS VARCHAR), chr(10) ORDER BY CAST(t AS VARCHAR))) AS obdb_hash
+  FROM {OBDB_MODEL} AS t
+  GROUP BY 1
+),
+ba AS (
+  SELECT
+    {PARTITION_KEY_SQL} AS partition_key,
+    COUNT(*) AS ba_rows,
+    md5(string_agg(CAST(t AS VARCHAR), chr(10) ORDER BY CAST(t AS VARCHAR))) AS ba_hash
+  FROM {BA_MODEL} AS t
+  GROUP BY 1
+)
+SELECT
+  COALESCE(obdb.partition_key, ba.partition_key) AS partition_key,
+  md5(concat_ws('|', $rules_version, obdb.obdb_hash, ba.ba_hash)) AS input_hash,
+  COALESCE(obdb.obdb_rows, 0) AS obdb_rows,
+  COALESCE(ba.ba_rows, 0) AS ba_rows
+FROM
+  obdb
+  FULL OUTER JOIN ba ON obdb.partition_key = ba.partition_key
+"""
+
+# Normalized partition records keyed on md5 of (name, city, state); the key
+# is what the match cache is addressed by.
+PARTITION_RECORDS_SQL = {
+    "partition_obdb": f"""
+SELECT
+  brewery_id,
+  name,
+  city,
+  state_province,
+  md5(to_json(list_value(name, city, state_province))) AS record_key
+FROM
+  (
+    SELECT
+      brewery_id,
+      LOWER(TRIM(name)) AS name,
+      LOWER(TRIM(city)) AS city,
+      LOWER(TRIM(state_province)) AS state_province
+    FROM
+      {OBDB_MODEL}
+    WHERE
+      TRIM(country) = 'United States'
+      AND {PARTITION_KEY_SQL} = $partition_key
+  )
+""",
+    "partition_ba": f"""
+SELECT
+  ba_brewery_id,
+  name,
+  city,
+  state_province,
+  md5(to_json(list_value(name, city, state_province))) AS record_key
+FROM
+  (
+    SELECT
+      ba_brewery_id,
+      LOWER(TRIM(name)) AS name,
+      LOWER(TRIM(city)) AS city,
+      LOWER(TRIM(state_province)) AS state_province
+    FROM
+      {BA_MODEL}
+    WHERE
+      TRIM(country) = 'United States'
+      AND {PARTITION_KEY_SQL} = $partition_key
+  )
+""",
+}
+
+# Keys not yet scored under the current rules version, and previously
+# scored keys that have since disappeared from the partition.
+PARTITION_KEY_CHANGES_SQL = f"""
+WITH present AS (
+  SELECT DISTINCT 'obdb' AS side, record_key FROM partition_obdb
+  UNION
+  SELECT DISTINCT 'ba' AS side, record_key FROM partition_ba
+),
+seen AS (
+  SELECT
+    side,
+    record_key
+  FROM
+    {CACHE_RECORDS_TABLE}
+  WHERE
+    rules_version = $rules_version
+    AND partition_key = $partition_key
+)
+SELECT
+  present.side,
+  present.record_key,
+  'new' AS change
+FROM
+  present
+  ANTI JOIN seen USING (side, record_key)
+UNION ALL
+SELECT
+  seen.side,
+  seen.record_key,
+  'vanished' AS change
+FROM
+  seen
+  ANTI JOIN present USING (side, record_key)
+"""
+
+# Candidate generation + scoring, run only for pairs touching a new key:
+# (new OBDB keys x all BA keys) UNION (all OBDB keys x new BA keys), so
+# unchanged keys are never joined against each other. Blocking mirrors the
+# match strategies: same state and either the same name (exact) or the same
+# city (fuzzy).
+PARTITION_SCORED_PAIRS_SQL = """
+WITH obdb_keys AS (
+  SELECT DISTINCT record_key, name, city, state_province FROM partition_obdb
+),
+ba_keys AS (
+  SELECT DISTINCT record_key, name, city, state_province FROM partition_ba
+),
+new_obdb_keys AS (
+  SELECT
+    *
+  FROM
+    obdb_keys
+  WHERE
+    record_key IN (
+      SELECT record_key FROM partition_key_changes
+      WHERE change = 'new' AND side = 'obdb'
+    )
+),
+new_ba_keys AS (
+  SELECT
+    *
+  FROM
+    ba_keys
+  WHERE
+    record_key IN (
+      SELECT record_key FROM partition_key_changes
+      WHERE change = 'new' AND side = 'ba'
+    )
+),
+candidates AS (
+  SELECT
+    obdb.record_key AS obdb_key,
+    ba.record_key AS ba_key,
+    obdb.name AS obdb_name,
+    ba.name AS ba_name,
+    obdb.city AS obdb_city,
+    ba.city AS ba_city
+  FROM
+    new_obdb_keys AS obdb
+    INNER JOIN ba_keys AS ba ON obdb.state_province = ba.state_province
+    AND obdb.name = ba.name
+  UNION
+  SELECT
+    obdb.record_key AS obdb_key,
+    ba.record_key AS ba_key,
+    obdb.name AS obdb_name,
+    ba.name AS ba_name,
+    obdb.city AS obdb_city,
+    ba.city AS ba_city
+  FROM
+    new_obdb_keys AS obdb
+    INNER JOIN ba_keys AS ba ON obdb.state_province = ba.state_province
+    AND obdb.city = ba.city
+  UNION
+  SELECT
+    obdb.record_key AS obdb_key,
+    ba.record_key AS ba_key,
+    obdb.name AS obdb_name,
+    ba.name AS ba_name,
+    obdb.city AS obdb_city,
+    ba.city AS ba_city
+  FROM
+    obdb_keys AS obdb
+    INNER JOIN new_ba_keys AS ba ON obdb.state_province = ba.state_province
+    AND obdb.name = ba.name
+  UNION
+  SELECT
+    obdb.record_key AS obdb_key,
+    ba.record_key AS ba_key,
+    obdb.name AS obdb_name,
+    ba.name AS ba_name,
+    obdb.city AS obdb_city,
+    ba.city AS ba_city
+  FROM
+    obdb_keys AS obdb
+    INNER JOIN new_ba_keys AS ba ON obdb.state_province = ba.state_province
+    AND obdb.city = ba.city
+),
+scored AS (
+  SELECT
+    obdb_key,
+    ba_key,
+    CASE
+      WHEN obdb_name = ba_name THEN 'exact_name_state'
+      WHEN obdb_city = ba_city
+      AND jaro_winkler_similarity(obdb_name, ba_name) > 0.90 THEN 'fuzzy_name_city'
+    END AS match_strategy,
+    CASE
+      WHEN obdb_name = ba_name THEN 1.0
+      ELSE jaro_winkler_similarity(obdb_name, ba_name)
+    END AS confidence
+  FROM
+    candidates
+)
+SELECT
+  CAST($partition_key AS VARCHAR) AS partition_key,
+  obdb_key,
+  ba_key,
+  CAST($rules_version AS VARCHAR) AS rules_version,
+  match_strategy IS NOT NULL AS decision,
+  match_strategy,
+  confidence
+FROM
+  scored
+"""
+
+# Cached pairs whose keys are both still present are reused as-is.
+PARTITION_CACHED_PAIRS_SQL = f"""
+SELECT
+  cache.obdb_key,
+  cache.ba_key,
+  cache.decision,
+  cache.match_strategy
+FROM
+  {CACHE_TABLE} AS cache
+WHERE
+  cache.rules_version = $rules_version
+  AND cache.partition_key = $partition_key
+  AND cache.obdb_key IN (SELECT record_key FROM partition_obdb)
+  AND cache.ba_key IN (SELECT record_key FROM partition_ba)
+"""
+
+# Per-partition port of map_brewery_ids over cached + freshly scored pair
+# decisions. Every strategy requires equal states, so resolving one state
+# at a time gives the same result as a single query over all US rows.
+PARTITION_MATCH_SQL = """
+WITH pair_decisions AS (
+  SELECT obdb_key, ba_key, match_strategy FROM partition_cached_pairs WHERE decision
+  UNION ALL
+  SELECT obdb_key, ba_key, match_strategy FROM partition_scored_pairs WHERE decision
+),
+name_state_matches AS (
+  SELECT
+    obdb.brewery_id,
+    ba.ba_brewery_id,
+    'exact_name_state' AS match_strategy
+  FROM
+    pair_decisions AS pair
+    INNER JOIN partition_obdb AS obdb ON obdb.record_key = pair.obdb_key
+    INNER JOIN partition_ba AS ba ON ba.record_key = pair.ba_key
+  WHERE
+    pair.match_strategy = 'exact_name_state'
+),
+fuzzy_name_city_matches AS (
+  SELECT
+    obdb.brewery_id,
+    ba.ba_brewery_id,
+    'fuzzy_name_city' AS match_strategy
+  FROM
+    pair_decisions AS pair
+    INNER JOIN partition_obdb AS obdb ON obdb.record_key = pair.obdb_key
+    INNER JOIN partition_ba AS ba ON ba.record_key = pair.ba_key
+  WHERE
+    pair.match_strategy = 'fuzzy_name_city'
+    -- IMPORTANT: Exclude breweries that we've already matched in the first strategy
+    AND obdb.brewery_id NOT IN (
+      SELECT
+        brewery_id
+      FROM
+        name_state_matches
+    )
+    AND ba.ba_brewery_id NOT IN (
+      SELECT
+        ba_brewery_id
+      FROM
+        name_state_matches
+    )
+)
+SELECT
+  *
+FROM
+  name_state_matches
+UNION ALL
+SELECT
+  *
+FROM
+  fuzzy_name_city_matches
+"""
+
+# Per-partition port of dim_breweries_combined. Matched rows carry the
+# partition's (brewery_id, ba_brewery_id, match_strategy) triples, so the
+# match table is derived from this single query.
+PARTITION_COMBINE_SQL = f"""
+WITH partition_matches AS (
+  {PARTITION_MATCH_SQL}
+),
+dim_obdb AS (
+  SELECT
+    *
+  FROM
+    {OBDB_MODEL}
+  WHERE
+    {PARTITION_KEY_SQL} = $partition_key
+),
+stg_ba AS (
+  SELECT
+    *
+  FROM
+    {BA_MODEL}
+  WHERE
+    {PARTITION_KEY_SQL} = $partition_key
+),
+matched_breweries AS (
+  SELECT
+    obdb.brewery_id,
+    ba.ba_brewery_id,
+    obdb.name,
+    obdb.brewery_type,
+    obdb.street_address,
+    obdb.city,
+    obdb.state_province,
+    obdb.postal_code,
+    obdb.country,
+    COALESCE(obdb.phone, ba.phone) AS phone,
+    COALESCE(obdb.website_url, ba.website_url) AS website_url,
+    obdb.longitude,
+    obdb.latitude,
+    map.match_strategy,
+    'matched' AS source_status
+  FROM
+    dim_obdb AS obdb
+    INNER JOIN partition_matches AS map ON obdb.brewery_id = map.brewery_id
+    LEFT JOIN stg_ba AS ba ON map.ba_brewery_id = ba.ba_brewery_id
+),
+unmatched_obdb AS (
+  SELECT
+    brewery_id,
+    NULL AS ba_brewery_id,
+    name,
+    brewery_type,
+    street_address,
+    city,
+    state_province,
+    postal_code,
+    country,
+    phone,
+    website_url,
+    longitude,
+    latitude,
+    NULL AS match_strategy,
+    'obdb_only' AS source_status
+  FROM
+    dim_obdb
+  WHERE
+    brewery_id NOT IN (
+      SELECT
+        brewery_id
+      FROM
+        partition_matches
+    )
+),
+unmatched_ba AS (
+  SELECT
+    ba_brewery_id AS brewery_id,
+    ba_brewery_id,
+    name,
+    brewery_type,
+    street_address,
+    city,
+    state_province,
+    postal_code,
+    country,
+    phone,
+    website_url,
+    longitude,
+    latitude,
+    NULL AS match_strategy,
+    'ba_only' AS source_status
+  FROM
+    stg_ba
+  WHERE
+    ba_brewery_id NOT IN (
+      SELECT
+        ba_brewery_id
+      FROM
+        partition_matches
+    )
+)
+SELECT
+  CAST($partition_key AS VARCHAR) AS partition_key,
+  *
+FROM
+  (
+    SELECT * FROM matched_breweries
+    UNION ALL
+    SELECT * FROM unmatched_obdb
+    UNION ALL
+    SELECT * FROM unmatched_ba
+  )
+"""
+
+
+@dataclass(frozen=True)
+class PartitionResult:
+    partition_key: str
+    input_hash: str
+    obdb_rows: int
+    ba_rows: int
+    matches: DataFrame
+    combined: DataFrame
+    scored_pairs: DataFrame
+    key_changes: DataFrame
+    cache_hits: int
+    duration_seconds: float
+
+
+def _stage_partition(cur: duckdb.DuckDBPyConnection, partition_key: str | None) -> None:
+    """
+    Build the partition's temp tables on `cur`. Temp tables are private to
+    the cursor, so concurrent workers never see each other's staging.
+    """
+    key_params = {"partition_key": partition_key}
+    cache_params = {**key_params, "rules_version": MATCHING_RULES_VERSION}
+    for name, sql in PARTITION_RECORDS_SQL.items():
+        cur.execute(f"CREATE OR REPLACE TEMP TABLE {name} AS {sql}", key_params)
+    for name, sql in (
+        ("partition_key_changes", PARTITION_KEY_CHANGES_SQL),
+        ("partition_scored_pairs", PARTITION_SCORED_PAIRS_SQL),
+        ("partition_cached_pairs", PARTITION_CACHED_PAIRS_SQL),
+    ):
+        cur.execute(f"CREATE OR REPLACE TEMP TABLE {name} AS {sql}", cache_params)
+
+
+def _ensure_tables(con: duckdb.DuckDBPyConnection) -> None:
+    con.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {CACHE_TABLE} (
+            partition_key STRING,
+            obdb_key STRING,
+            ba_key STRING,
+            rules_version STRING,
+            decision BOOLEAN,
+            match_strategy STRING,
+            confidence DOUBLE,
+            updated_at TIMESTAMP WITH TIME ZONE
+        )
+        """
+    )
+    con.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {CACHE_RECORDS_TABLE} (
+            partition_key STRING,
+            side STRING,
+            record_key STRING,
+            rules_version STRING,
+            updated_at TIMESTAMP WITH TIME ZONE
+        )
+        """
+    )
+    con.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {PARTITION_STATE_TABLE} (
+            partition_key STRING,
+            input_hash STRING,
+            obdb_rows BIGINT,
+            ba_rows BIGINT,
+            match_rows BIGINT,
+            combined_rows BIGINT,
+            duration_seconds DOUBLE,
+            updated_at TIMESTAMP WITH TIME ZONE
+        )
+        """
+    )
+    # Derive output column types from the upstream models: a NULL partition
+    # key stages empty temp tables, so these selects return no rows.
+    _stage_partition(con, None)
+    con.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {COMBINED_TABLE} AS
+        SELECT * FROM ({PARTITION_COMBINE_SQL}) LIMIT 0
+        """,
+        {"partition_key": None},
+    )
+    con.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {MATCHES_TABLE} AS
+        SELECT {", ".join(MATCH_COLUMNS)} FROM {COMBINED_TABLE} LIMIT 0
+        """
+    )
+
+
+def _compute_partition(
+    con: duckdb.DuckDBPyConnection, fingerprint: dict[str, Any]
+) -> PartitionResult:
+    started = time.monotonic()
+    partition_key = fingerprint["partition_key"]
+    # Each worker gets its own cursor so partitions run concurrently
+    cur = con.cursor()
+    try:
+        _stage_partition(cur, partition_key)
+        combined = cur.execute(
+            PARTITION_COMBINE_SQL, {"partition_key": partition_key}
+        ).df()
+        scored_pairs = cur.execute("SELECT * FROM partition_scored_pairs").df()
+        key_changes = cur.execute("SELECT * FROM partition_key_changes").df()
+        hits = cur.execute("SELECT COUNT(*) FROM partition_cached_pairs").fetchone()
+    finally:
+        cur.close()
+    matches = combined.loc[combined["source_status"] == "matched", MATCH_COLUMNS]
+    return PartitionResult(
+        partition_key=partition_key,
+        input_hash=fingerprint["input_hash"],
+        obdb_rows=int(fingerprint["obdb_rows"]),
+        ba_rows=int(fingerprint["ba_rows"]),
+        matches=matches,
+        combined=combined,
+        scored_pairs=scored_pairs,
+        key_changes=key_changes,
+        cache_hits=hits[0] if hits is not None else 0,
+        duration_seconds=time.monotonic() - started,
+    )
+
+
+def _write_cache(con: duckdb.DuckDBPyConnection, result: PartitionResult) -> None:
+    params = (result.partition_key, MATCHING_RULES_VERSION)
+    if not result.key_changes.empty:
+        con.register("partition_df", result.key_changes)
+        # Forget vanished keys and their pairs so a returning key is rescored
+        # against any keys that arrived while it was gone.
+        con.execute(
+            f"""
+            DELETE FROM {CACHE_TABLE} AS cache
+            USING partition_df AS changes
+            WHERE changes.change = 'vanished'
+              AND cache.partition_key = ?
+              AND cache.rules_version = ?
+              AND (
+                (changes.side = 'obdb' AND cache.obdb_key = changes.record_key)
+                OR (changes.side = 'ba' AND cache.ba_key = changes.record_key)
+              )
+            """,
+            params,
+        )
+        con.execute(
+            f"""
+            DELETE FROM {CACHE_RECORDS_TABLE} AS records
+            USING partition_df AS changes
+            WHERE changes.change = 'vanished'
+              AND records.partition_key = ?
+              AND records.rules_version = ?
+              AND records.side = changes.side
+              AND records.record_key = changes.record_key
+            """,
+            params,
+        )
+        con.execute(
+            f"""
+            INSERT INTO {CACHE_RECORDS_TABLE}
+            SELECT ?, side, record_key, ?, current_timestamp
+            FROM partition_df
+            WHERE change = 'new'
+            """,
+            params,
+        )
+    if not result.scored_pairs.empty:
+        con.register("partition_df", result.scored_pairs)
+        con.execute(
+            f"""
+            INSERT INTO {CACHE_TABLE} BY NAME
+            SELECT *, current_timestamp AS updated_at FROM partition_df
+            """
+        )
+
+
+def _write_results(
+    con: duckdb.DuckDBPyConnection,
+    results: list[PartitionResult],
+    removed_keys: list[str],
+) -> None:
+    stale_keys = [r.partition_key for r in results] + removed_keys
+    con.execute("BEGIN TRANSACTION")
+    try:
+        for table in (MATCHES_TABLE, COMBINED_TABLE, PARTITION_STATE_TABLE):
+            con.execute(
+                f"DELETE FROM {table} WHERE list_contains(?, partition_key)",
+                [stale_keys],
+            )
+        for table in (CACHE_TABLE, CACHE_RECORDS_TABLE):
+            con.execute(
+                f"DELETE FROM {table} WHERE list_contains(?, partition_key)",
+                [removed_keys],
+            )
+        for result in results:
+            _write_cache(con, result)
+            if not result.matches.empty:
+                con.register("partition_df", result.matches)
+                con.execute(
+                    f"INSERT INTO {MATCHES_TABLE} BY NAME SELECT * FROM partition_df"
+                )
+            if not result.combined.empty:
+                con.register("partition_df", result.combined)
+                con.execute(
+                    f"INSERT INTO {COMBINED_TABLE} BY NAME SELECT * FROM partition_df"
+                )
+            con.execute(
+                f"""
+                INSERT INTO {PARTITION_STATE_TABLE}
+                VALUES (?, ?, ?, ?, ?, ?, ?, current_timestamp)
+                """,
+                (
+                    result.partition_key,
+                    result.input_hash,
+                    result.obdb_rows,
+                    result.ba_rows,
+                    len(result.matches),
+                    len(result.combined),
+                    result.duration_seconds,
+                ),
+            )
+        con.unregister("partition_df")
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+
+
+def run_partitioned_matching(
+    db_path: str | Path, parallelism: int = 4, full_refresh: bool = False
+) -> dict[str, Any]:
+    """
+    Rebuild brewery matches and the combined dimension one state_province
+    partition at a time, recomputing only partitions whose inputs changed.
+
+    Changed partitions run concurrently on `parallelism` DuckDB cursors and
+    are written back in a single transaction. Within a partition only pairs
+    touching a new or changed (name, city, state) record are scored; other
+    pair decisions come from the match cache, which is discarded whenever
+    MATCHING_RULES_VERSION changes. Returns run metrics including cache hit
+    rate and per-partition timings (seconds) for recomputed partitions.
+    """
+    started = time.monotonic()
+    with duckdb.connect(database=str(db_path), read_only=False) as con:
+        if full_refresh:
+            for table in (
+                MATCHES_TABLE,
+                COMBINED_TABLE,
+                PARTITION_STATE_TABLE,
+                CACHE_TABLE,
+                CACHE_RECORDS_TABLE,
+            ):
+                con.execute(f"DROP TABLE IF EXISTS {table}")
+        _ensure_tables(con)
+        for table in (CACHE_TABLE, CACHE_RECORDS_TABLE):
+            con.execute(
+                f"DELETE FROM {table} WHERE rules_version <> ?",
+                [MATCHING_RULES_VERSION],
+            )
+
+        fingerprints = (
+            con.execute(
+                PARTITION_FINGERPRINTS_SQL, {"rules_version": MATCHING_RULES_VERSION}
+            )
+            .df()
+            .to_dict("records")
+        )
+        previous = dict(
+            con.execute(
+                f"SELECT partition_key, input_hash FROM {PARTITION_STATE_TABLE}"
+            ).fetchall()
+        )
+        current_keys = {f["partition_key"] for f in fingerprints}
+        removed_keys = sorted(set(previous) - current_keys)
+        changed = [
+            f
+            for f in fingerprints
+            if previous.get(f["partition_key"]) != f["input_hash"]
+        ]
+
+        results: list[PartitionResult] = []
+        with ThreadPoolExecutor(max_workers=max(1, int(parallelism))) as pool:
+            futures = [pool.submit(_compute_partition, con, f) for f in changed]
+            for future in as_completed(futures):
+                results.append(future.result())
+
+        _write_results(con, results, removed_keys)
+
+        match_rows = con.sql(f"SELECT COUNT(*) FROM {MATCHES_TABLE}").fetchone()
+        combined_rows = con.sql(f"SELECT COUNT(*) FROM {COMBINED_TABLE}").fetchone()
+
+    timings = sorted(results, key=lambda r: r.duration_seconds, reverse=True)
+    cache_hits = sum(r.cache_hits for r in results)
+    cache_misses = sum(len(r.scored_pairs) for r in results)
+    cache_lookups = cache_hits + cache_misses
+    return {
+        "partitions_total": len(fingerprints),
+        "partitions_recomputed": len(results),
+        "partitions_skipped": len(fingerprints) - len(results),
+        "partitions_removed": len(removed_keys),
+        "parallelism": max(1, int(parallelism)),
+        "match_rows": match_rows[0] if match_rows is not None else 0,
+        "combined_rows": combined_rows[0] if combined_rows is not None else 0,
+        "rules_version": MATCHING_RULES_VERSION,
+        "cache_hits": cache_hits,
+        "cache_misses": cache_misses,
+        "cache_hit_rate": (
+            round(cache_hits / cache_lookups, 4) if cache_lookups else None
+        ),
+        "partition_seconds": {
+            r.partition_key: round(r.duration_seconds, 4) for r in timings
+        },
+        "duration_seconds": round(time.monotonic() - started, 4),
+    }
+
+
+def main(parallelism: int | None = None, full_refresh: bool = False) -> dict[str, Any]:
+    """
+    Run partitioned matching against the configured DuckDB file and record
+    the run (with per-partition timings) in ingest_runs.
+    """
+    settings = load_settings()
+    started = time.monotonic()
+    db_path = settings.db_path
+    workers = parallelism if parallelism is not None else settings.match_parallelism
+
+    print("--- Partitioned matching started ---")
+    try:
+        metrics = run_partitioned_matching(
+            db_path, parallelism=workers, full_refresh=full_refresh
+        )
+        print(
+            f"✅ Recomputed {metrics['partitions_recomputed']} of "
+            f"{metrics['partitions_total']} partitions with {metrics['parallelism']} workers."
+        )
+        if metrics["cache_hit_rate"] is not None:
+            print(
+                f"🗃️  Match cache hit rate {metrics['cache_hit_rate']:.1%} "
+                f"({metrics['cache_hits']} cached, {metrics['cache_misses']} scored pairs)."
+            )
+        for key, seconds in list(metrics["partition_seconds"].items())[:5]:
+            print(f"⏱️  {key or '<none>'}: {seconds:.3f}s")
+        with duckdb.connect(database=str(db_path), read_only=False) as con:
+            log_ingest_run(
+                con,
+                "match_partitions",
+                MATCHES_TABLE,
+                metrics["match_rows"],
+                "success",
+                None,
+                metrics=metrics,
+                duration_seconds=time.monotonic() - started,
+                ingest_log_path=settings.ingest_log_path,
+            )
+        print("--- Partitioned matching finished ---")
+        return metrics
+    except Exception as exc:
+        print(f"❌ Matching failed: {exc}")
+        try:
+            with duckdb.connect(database=str(db_path), read_only=False) as con:
+                log_ingest_run(
+                    con,
+                    "match_partitions",
+                    MATCHES_TABLE,
+                    0,
+                    "failed",
+                    note=str(exc),
+                    duration_seconds=time.monotonic() - started,
+                    ingest_log_path=settings.ingest_log_path,
+                )
+        finally:
+            raise
+
+
+__all__ = [
+    "MATCHING_RULES_VERSION",
+    "MATCHES_TABLE",
+    "COMBINED_TABLE",
+    "PARTITION_STATE_TABLE",
+    "CACHE_TABLE",
+    "CACHE_RECORDS_TABLE",
+    "PartitionResult",
+    "run_partitioned_matching",
+    "main",
+]
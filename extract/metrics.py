@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Mapping
+
+import yaml
+
+from extract.config import Settings
+from extract.ingest_log import fetch_last_successes, fetch_latest_ingest_runs
+from extract.observability import log_event
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# name -> (type, help). Registries only accept metrics declared here.
+METRICS: dict[str, tuple[str, str]] = {
+    "obdb_ingest_rows": ("gauge", "Rows written by the latest run of each source."),
+    "obdb_ingest_bytes_fetched": (
+        "gauge",
+        "Bytes fetched by the latest run of each source.",
+    ),
+    "obdb_ingest_duration_seconds": (
+        "gauge",
+        "Duration of the latest run of each source.",
+    ),
+    "obdb_ingest_success": (
+        "gauge",
+        "1 if the latest run of each source succeeded, else 0.",
+    ),
+    "obdb_ingest_last_run_timestamp_seconds": (
+        "gauge",
+        "Unix time of the latest run of each source.",
+    ),
+    "obdb_ingest_last_success_timestamp_seconds": (
+        "gauge",
+        "Unix time of the latest successful run of each source.",
+    ),
+    "obdb_source_freshness_age_seconds": (
+        "gauge",
+        "Seconds since the latest successful load of each dbt source table.",
+    ),
+    "obdb_source_freshness_status": (
+        "gauge",
+        "Freshness against sources.yml thresholds: 0 pass, 1 warn, 2 error.",
+    ),
+    "obdb_match_cache_hit_rate": (
+        "gauge",
+        "Match cache hit rate of the latest partitioned matching run.",
+    ),
+    "obdb_match_partition_duration_seconds": (
+        "gauge",
+        "Per-partition duration of the latest partitioned matching run.",
+    ),
+    "obdb_dbt_model_duration_seconds": (
+        "gauge",
+        "Execution time of each dbt model in the latest run of each stage.",
+    ),
+    "obdb_dbt_run_elapsed_seconds": (
+        "gauge",
+        "Elapsed time of the latest dbt run of each stage.",
+    ),
+    "obdb_dbt_run_generated_timestamp_seconds": (
+        "gauge",
+        "Unix time each stage's run_results was generated.",
+    ),
+    "obdb_metrics_collect_duration_seconds": (
+        "gauge",
+        "Time spent collecting this scrape.",
+    ),
+}
+
+_PERIOD_SECONDS = {"minute": 60, "hour": 3600, "day": 86400}
+# Per-stage copies of target/run_results.json; see the dbt tasks in the DAG.
+DBT_STAGE_RESULTS_GLOB = "run_results_*.json"
+
+Labels = Mapping[str, str]
+
+
+def _label_key(labels: Labels | None) -> tuple[tuple[str, str], ...]:
+    return tuple(sorted((labels or {}).items()))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """
+    Minimal thread-safe gauge store rendered as OpenMetrics text.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._values: dict[str, dict[tuple[tuple[str, str], ...], float]] = {}
+
+    def _check(self, name: str, kind: str | None = None) -> None:
+        if name not in METRICS:
+            raise KeyError(f"Undeclared metric: {name}")
+        if kind is not None and METRICS[name][0] != kind:
+            raise ValueError(f"{name} is a {METRICS[name][0]}, not a {kind}")
+
+    def set(self, name: str, value: float, labels: Labels | None = None) -> None:
+        self._check(name, "gauge")
+        with self._lock:
+            self._values.setdefault(name, {})[_label_key(labels)] = float(value)
+
+    def get(self, name: str, labels: Labels | None = None) -> float:
+        self._check(name)
+        with self._lock:
+            return self._values.get(name, {}).get(_label_key(labels), 0.0)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            for name in sorted(self._values):
+                kind, help_text = METRICS[name]
+                lines.append(f"# TYPE {name} {kind}")
+                lines.append(f"# HELP {name} {help_text}")
+                for key, value in sorted(self._values[name].items()):
+                    label_str = ",".join(f'{k}="{_escape_label(v)}"' for k, v in key)
+                    suffix = f"{{{label_str}}}" if label_str else ""
+                    lines.append(f"{name}{suffix} {value:g}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def _freshness_seconds(freshness: Mapping[str, Any] | None) -> dict[str, float]:
+    thresholds: dict[str, float] = {}
+    for kind in ("warn_after", "error_after"):
+        spec = (freshness or {}).get(kind) or {}
+        period = _PERIOD_SECONDS.get(str(spec.get("period")))
+        if spec.get("count") is not None and period is not None:
+            thresholds[kind] = int(spec["count"]) * period
+    return thresholds
+
+
+def parse_freshness_thresholds(
+    sources_path: str | Path,
+) -> dict[str, dict[str, float]]:
+    """
+    Return {table_name: {"warn_after": seconds, "error_after": seconds}}
+    from a dbt sources.yml. Table-level freshness overrides the source's
+    (an explicit null disables it); tables without thresholds are omitted.
+    """
+    path = Path(sources_path)
+    if not path.exists():
+        return {}
+    document = yaml.safe_load(path.read_text()) or {}
+    thresholds: dict[str, dict[str, float]] = {}
+    for source in document.get("sources") or []:
+        source_freshness = source.get("freshness")
+        for table in source.get("tables") or []:
+            config = table.get("config") or {}
+            if "freshness" in table:
+                freshness = table["freshness"]
+            elif "freshness" in config:
+                freshness = config["freshness"]
+            else:
+                freshness = source_freshness
+            table_thresholds = _freshness_seconds(freshness)
+            if table_thresholds:
+                thresholds[table.get("identifier", table["name"])] = table_thresholds
+    return thresholds
+
+
+def freshness_status(age_seconds: float, thresholds: Mapping[str, float]) -> int:
+    if "error_after" in thresholds and age_seconds > thresholds["error_after"]:
+        return 2
+    if "warn_after" in thresholds and age_seconds > thresholds["warn_after"]:
+        return 1
+    return 0
+
+
+def _timestamp(value: Any) -> float:
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return datetime.fromisoformat(str(value)).timestamp()
+
+
+def _collect_ingest_runs(
+    registry: MetricsRegistry,
+    latest: list[dict[str, Any]],
+    last_successes: list[dict[str, Any]],
+    thresholds: Mapping[str, Mapping[str, float]],
+    now: float,
+) -> None:
+    for row in latest:
+        labels = {"source": row["source"], "table": str(row["table_name"])}
+        metrics = json.loads(row.get("metrics_json") or "{}")
+        registry.set("obdb_ingest_rows", row["row_count"] or 0, labels)
+        registry.set(
+            "obdb_ingest_success", 1.0 if row["status"] == "success" else 0.0, labels
+        )
+        registry.set(
+            "obdb_ingest_last_run_timestamp_seconds", _timestamp(row["ts"]), labels
+        )
+        if row.get("duration_seconds") is not None:
+            registry.set(
+                "obdb_ingest_duration_seconds", row["duration_seconds"], labels
+            )
+        if "bytes_fetched" in metrics:
+            registry.set("obdb_ingest_bytes_fetched", metrics["bytes_fetched"], labels)
+        if metrics.get("cache_hit_rate") is not None:
+            registry.set("obdb_match_cache_hit_rate", metrics["cache_hit_rate"])
+        for partition, seconds in metrics.get("partition_seconds", {}).items():
+            registry.set(
+                "obdb_match_partition_duration_seconds",
+                seconds,
+                {"partition": partition},
+            )
+
+    # Queried separately from `latest` so a long run of failures cannot push
+    # the last success out of view before freshness reaches error.
+    for row in last_successes:
+        labels = {"source": row["source"], "table": str(row["table_name"])}
+        success_ts = _timestamp(row["ts"])
+        registry.set("obdb_ingest_last_success_timestamp_seconds", success_ts, labels)
+        if row["table_name"] in thresholds:
+            age = max(0.0, now - success_ts)
+            registry.set("obdb_source_freshness_age_seconds", age, labels)
+            registry.set(
+                "obdb_source_freshness_status",
+                freshness_status(age, thresholds[row["table_name"]]),
+                labels,
+            )
+
+
+def _collect_dbt_run_results(registry: MetricsRegistry, target_dir: Path) -> None:
+    # dbt overwrites run_results.json on every invocation (the last one in
+    # the DAG is `dbt test`), so each `dbt run` stage keeps its own copy.
+    for path in sorted(target_dir.glob(DBT_STAGE_RESULTS_GLOB)):
+        stage = path.stem.removeprefix("run_results_")
+        payload = json.loads(path.read_text())
+        for result in payload.get("results", []):
+            unique_id = str(result.get("unique_id", ""))
+            if not unique_id.startswith("model."):
+                continue
+            registry.set(
+                "obdb_dbt_model_duration_seconds",
+                result.get("execution_time") or 0.0,
+                {
+                    "stage": stage,
+                    "model": unique_id,
+                    "status": str(result.get("status", "")),
+                },
+            )
+        if payload.get("elapsed_time") is not None:
+            registry.set(
+                "obdb_dbt_run_elapsed_seconds",
+                payload["elapsed_time"],
+                {"stage": stage},
+            )
+        generated_at = payload.get("metadata", {}).get("generated_at")
+        if generated_at:
+            registry.set(
+                "obdb_dbt_run_generated_timestamp_seconds",
+                _timestamp(generated_at.replace("Z", "+00:00")),
+                {"stage": stage},
+            )
+
+
+def collect_metrics(settings: Settings, now: float | None = None) -> MetricsRegistry:
+    """
+    Build a fresh registry from durable pipeline state: the ingest run side
+    log (never the working DB, whose lock would block writers), the
+    per-stage dbt run results and the freshness thresholds in sources.yml.
+    """
+    started = time.perf_counter()
+    registry = MetricsRegistry()
+    thresholds = parse_freshness_thresholds(
+        settings.dbt_project_dir / "models" / "sources.yml"
+    )
+    _collect_ingest_runs(
+        registry,
+        fetch_latest_ingest_runs(settings.ingest_log_path),
+        fetch_last_successes(settings.ingest_log_path),
+        thresholds,
+        time.time() if now is None else now,
+    )
+    _collect_dbt_run_results(registry, settings.dbt_project_dir / "target")
+    registry.set("obdb_metrics_collect_duration_seconds", time.perf_counter() - started)
+    return registry
+
+
+def write_textfile(registry: MetricsRegistry, path: str | Path) -> Path:
+    """
+    Atomically write the registry for a node_exporter textfile collector.
+    """
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(f".{target.name}.tmp")
+    tmp_path.write_text(registry.render())
+    os.replace(tmp_path, target)
+    return target
+
+
+def serve_metrics(
+    collect: Callable[[], MetricsRegistry], host: str = "127.0.0.1", port: int = 9464
+) -> ThreadingHTTPServer:
+    """
+    Serve `collect()` on GET /metrics from a daemon thread. Pass port=0 to
+    bind an ephemeral port (see `server.server_port`).
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = collect().render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            log_event("metrics_scrape", level=logging.DEBUG, path=self.path)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+__all__ = [
+    "METRICS",
+    "MetricsRegistry",
+    "parse_freshness_thresholds",
+    "freshness_status",
+    "collect_metrics",
+    "write_textfile",
+    "serve_metrics",
+]
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import secrets
+import sys
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Mapping
+
+SERVICE_NAME = "obdb-etl"
+
+# Bytes downloaded by fetch_bytes in this process, per host. Loaders report
+# the delta over their own run (`cli all` runs several in one process).
+_FETCH_LOCK = threading.Lock()
+_FETCH_BYTES: dict[str, int] = {}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "event": record.getMessage(),
+        }
+        payload.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+def get_logger() -> logging.Logger:
+    """
+    Return the `obdb_etl` logger, attaching a JSON stderr handler on first
+    use. Set OBDB_JSON_LOGS=0 to silence it.
+    """
+    logger = logging.getLogger("obdb_etl")
+    if not logger.handlers:
+        handler: logging.Handler
+        if os.getenv("OBDB_JSON_LOGS", "1") == "0":
+            handler = logging.NullHandler()
+        else:
+            handler = logging.StreamHandler(sys.stderr)
+            handler.setFormatter(JsonFormatter())
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+def log_event(event: str, level: int = logging.INFO, **fields: Any) -> None:
+    """
+    Emit one structured JSON log line: {"ts", "level", "event", **fields}.
+    """
+    get_logger().log(level, event, extra={"fields": fields})
+
+
+def record_fetch(url: str, num_bytes: int, duration_seconds: float) -> None:
+    host = url.split("/")[2] if "://" in url else url
+    with _FETCH_LOCK:
+        _FETCH_BYTES[host] = _FETCH_BYTES.get(host, 0) + num_bytes
+    log_event(
+        "fetch",
+        host=host,
+        bytes=num_bytes,
+        duration_seconds=round(duration_seconds, 4),
+    )
+
+
+def fetched_bytes() -> int:
+    """
+    Return the total bytes fetched by this process so far.
+    """
+    with _FETCH_LOCK:
+        return sum(_FETCH_BYTES.values())
+
+
+def _trace_id(trace_key: str) -> str:
+    return hashlib.md5(trace_key.encode()).hexdigest()
+
+
+def record_span(
+    path: str | Path,
+    name: str,
+    trace_key: str,
+    start: datetime,
+    end: datetime,
+    status: str = "ok",
+    attributes: Mapping[str, Any] | None = None,
+) -> dict[str, Any]:
+    """
+    Append one span as an OTLP/JSON ExportTraceServiceRequest line.
+
+    Spans sharing a `trace_key` (e.g. an Airflow run_id) share a trace id,
+    so a collector shows every task of a DAG run as one trace.
+    """
+    span = {
+        "traceId": _trace_id(trace_key),
+        "spanId": secrets.token_hex(8),
+        "name": name,
+        "kind": 1,
+        "startTimeUnixNano": str(int(start.timestamp() * 1e9)),
+        "endTimeUnixNano": str(int(end.timestamp() * 1e9)),
+        "attributes": [
+            {"key": k, "value": {"stringValue": str(v)}}
+            for k, v in (attributes or {}).items()
+        ],
+        # OTLP status codes: 1 = OK, 2 = ERROR
+        "status": {"code": 1 if status == "ok" else 2},
+    }
+    request = {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": SERVICE_NAME}}
+                    ]
+                },
+                "scopeSpans": [{"scope": {"name": "obdb_etl"}, "spans": [span]}],
+            }
+        ]
+    }
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with target.open("a") as fh:
+        fh.write(json.dumps(request) + "\n")
+    return span
+
+
+__all__ = [
+    "JsonFormatter",
+    "get_logger",
+    "log_event",
+    "record_fetch",
+    "fetched_bytes",
+    "record_span",
+]
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import os
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+
+import duckdb
+
+SNAPSHOT_PREFIX = "obdb-"
+SNAPSHOT_SUFFIX = ".duckdb"
+CURRENT_POINTER = "CURRENT"
+# Keep at least the current and previous snapshot so a reader that resolved
+# CURRENT just before a publish can still open the file it was pointed at.
+MIN_RETAIN = 2
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(text)
+    os.replace(tmp_path, path)
+
+
+def list_snapshots(snapshot_dir: str | Path) -> list[Path]:
+    """
+    Return published snapshot files, newest first.
+    """
+    directory = Path(snapshot_dir)
+    if not directory.is_dir():
+        return []
+    snapshots = [
+        p for p in directory.glob(f"{SNAPSHOT_PREFIX}*{SNAPSHOT_SUFFIX}") if p.is_file()
+    ]
+    # Names embed a UTC timestamp, so lexical order is publish order
+    return sorted(snapshots, key=lambda p: p.name, reverse=True)
+
+
+def current_snapshot(snapshot_dir: str | Path) -> Path | None:
+    """
+    Return the snapshot the CURRENT pointer refers to, if it still exists.
+    """
+    pointer = Path(snapshot_dir) / CURRENT_POINTER
+    if not pointer.exists():
+        return None
+    name = pointer.read_text().strip()
+    if not name:
+        return None
+    path = pointer.parent / name
+    return path if path.is_file() else None
+
+
+def resolve_read_path(db_path: str | Path, snapshot_dir: str | Path) -> Path:
+    """
+    Path readers should open: the current snapshot, or the working DB when
+    nothing has been published yet.
+    """
+    return current_snapshot(snapshot_dir) or Path(db_path)
+
+
+def prune_snapshots(snapshot_dir: str | Path, retain: int) -> list[Path]:
+    """
+    Delete all but the newest `retain` snapshots (never the current one).
+    `retain` is raised to MIN_RETAIN. Returns the paths that were removed.
+    """
+    keep = max(MIN_RETAIN, int(retain))
+    current = current_snapshot(snapshot_dir)
+    removed: list[Path] = []
+    for path in list_snapshots(snapshot_dir)[keep:]:
+        if current is not None and path == current:
+            continue
+        try:
+            path.unlink()
+        except OSError:
+            # A reader may still hold the file open on platforms that lock it
+            continue
+        removed.append(path)
+    return removed
+
+
+def publish_snapshot(
+    db_path: str | Path, snapshot_dir: str | Path, retain: int = 3
+) -> Path:
+    """
+    Publish the working DuckDB file as an immutable read-only snapshot.
+
+    The working file is checkpointed, copied to a temp file inside
+    `snapshot_dir`, renamed into place and only then made current by
+    atomically rewriting the CURRENT pointer. Readers therefore always see
+    either the previous or the new snapshot, never a partial copy.
+    """
+    source = Path(db_path)
+    if not source.exists():
+        raise FileNotFoundError(f"DuckDB file not found: {source}")
+
+    directory = Path(snapshot_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    # Flush the WAL so the copied file is self-contained
+    with duckdb.connect(database=str(source), read_only=False) as con:
+        con.execute("CHECKPOINT")
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    target = directory / f"{SNAPSHOT_PREFIX}{stamp}{SNAPSHOT_SUFFIX}"
+    tmp_target = directory / f".{target.name}.tmp"
+    shutil.copyfile(source, tmp_target)
+    os.replace(tmp_target, target)
+
+    _atomic_write_text(directory / CURRENT_POINTER, target.name)
+    prune_snapshots(directory, retain)
+    return target
+
+
+__all__ = [
+    "list_snapshots",
+    "current_snapshot",
+    "resolve_read_path",
+    "prune_snapshots",
+    "publish_snapshot",
+]
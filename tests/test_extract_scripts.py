@@ -1,6 +1,8 @@
+import json
+
 import duckdb
 import pandas as pd
-from extract import load_ba_json_data, load_obdb_csv_data
+from extract import load_ba_json_data, load_obdb_csv_data, observability
 
 
 def test_load_obdb_csv_data_smoke(monkeypatch, tmp_path):
@@ -83,6 +85,9 @@ def test_load_ba_json_data_smoke(monkeypatch, tmp_path):
 
     monkeypatch.setattr(load_ba_json_data.duckdb, "connect", lambda *a, **k: fake_con)
     monkeypatch.setattr(load_ba_json_data, "write_df_to_duckdb", fake_write_df)
+    # Bytes fetched earlier in the process (e.g. by the OBDB loader under
+    # `cli all`) must not be attributed to this run
+    observability.record_fetch("https://example.com/breweries.csv", 1000, 0.1)
 
     load_ba_json_data.main()
 
@@ -91,3 +96,9 @@ def test_load_ba_json_data_smoke(monkeypatch, tmp_path):
     assert holder.get("table_name") == "raw_ba_json_data"
     assert holder.get("row_count") == 1
     assert fake_con.ingest_records  # ingest logging was attempted
+    insert_params = next(
+        params
+        for query, params in fake_con.ingest_records
+        if query.startswith("INSERT INTO ingest_runs")
+    )
+    assert json.loads(insert_params[6])["bytes_fetched"] == 0
@@ -0,0 +1,77 @@
+import sqlite3
+import subprocess
+import sys
+
+import duckdb
+import pytest
+
+from extract import cli, ingest_log
+from extract.config import PROJECT_ROOT
+
+
+def _row(source, status, ts):
+    return {"ts": ts, "source": source, "table_name": "t", "status": status}
+
+
+def test_fetch_recent_ingest_runs_newest_first(tmp_path):
+    path = tmp_path / "ingest_runs.sqlite"
+    assert ingest_log.fetch_recent_ingest_runs(path) == []
+
+    ingest_log.append_ingest_run(path, _row("a", "success", "2025-09-10T00:00:00"))
+    ingest_log.append_ingest_run(path, _row("b", "failed", "2025-09-10T01:00:00"))
+
+    rows = ingest_log.fetch_recent_ingest_runs(path, limit=1)
+    assert [(r["source"], r["status"]) for r in rows] == [("b", "failed")]
+
+
+def test_open_reader_does_not_block_writer(tmp_path):
+    path = tmp_path / "ingest_runs.sqlite"
+    ingest_log.append_ingest_run(path, _row("a", "success", "2025-09-10T00:00:00"))
+
+    # Keep a read transaction open, as a slow scrape would
+    reader = sqlite3.connect(path)
+    try:
+        reader.execute("BEGIN")
+        reader.execute("SELECT COUNT(*) FROM ingest_runs").fetchone()
+        subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys; from extract import ingest_log; "
+                "ingest_log.append_ingest_run(sys.argv[1], "
+                "{'ts': '2025-09-10T01:00:00', 'source': 'b', 'status': 'failed'})",
+                str(path),
+            ],
+            check=True,
+            cwd=PROJECT_ROOT,
+            timeout=10,
+        )
+    finally:
+        reader.close()
+    assert len(ingest_log.fetch_recent_ingest_runs(path)) == 2
+
+
+def test_cli_ingest_runs_reads_log_without_opening_duckdb(
+    monkeypatch, tmp_path, capsys
+):
+    monkeypatch.setenv("OBDB_DUCKDB_PATH", str(tmp_path / "obdb.duckdb"))
+    ingest_log.append_ingest_run(
+        tmp_path / "ingest_runs.sqlite", _row("obdb_csv", "failed", "2025-09-10")
+    )
+
+    def no_duckdb(*args, **kwargs):
+        raise AssertionError("ingest-runs must not open a DuckDB file")
+
+    monkeypatch.setattr(duckdb, "connect", no_duckdb)
+    cli.run("ingest-runs")
+    assert '"status": "failed"' in capsys.readouterr().out
+
+
+def test_cli_ingest_runs_snapshot_requires_published_snapshot(monkeypatch, tmp_path):
+    monkeypatch.setenv("OBDB_DUCKDB_PATH", str(tmp_path / "obdb.duckdb"))
+    monkeypatch.setenv("OBDB_SNAPSHOT_DIR", str(tmp_path / "snapshots"))
+    with duckdb.connect(str(tmp_path / "obdb.duckdb"), read_only=False) as con:
+        con.execute("CREATE TABLE ingest_runs (ts TIMESTAMP)")
+
+    with pytest.raises(SystemExit, match="No published snapshot"):
+        cli.run("ingest-runs", snapshot=True)
@@ -2,7 +2,7 @@ import duckdb
 import pandas as pd
 import pytest
 
-from extract import io_utils
+from extract import ingest_log, io_utils
 
 
 def test_load_csv_from_url_with_retry(monkeypatch):
@@ -41,3 +41,13 @@ def test_log_ingest_run(tmp_path):
             "SELECT source, table_name, row_count, status, note FROM ingest_runs"
         ).fetchone()
     assert out == ("src", "tbl", 5, "success", "note")
+
+
+def test_log_ingest_run_writes_side_log(tmp_path):
+    log_path = tmp_path / "ingest_runs.sqlite"
+    with duckdb.connect(str(tmp_path / "test.duckdb"), read_only=False) as con:
+        io_utils.log_ingest_run(
+            con, "src", "tbl", 5, "failed", "boom", ingest_log_path=log_path
+        )
+    [row] = ingest_log.fetch_recent_ingest_runs(log_path)
+    assert (row["source"], row["status"], row["note"]) == ("src", "failed", "boom")
@@ -0,0 +1,138 @@
+import duckdb
+import pandas as pd
+
+from extract import matching
+
+
+def _seed(db_path, obdb_rows, ba_rows):
+    obdb = pd.DataFrame(
+        obdb_rows,
+        columns=["brewery_id", "name", "city", "state_province", "country"],
+    )
+    ba = pd.DataFrame(
+        ba_rows,
+        columns=["ba_brewery_id", "name", "city", "state_province", "country"],
+    )
+    for df in (obdb, ba):
+        for col in ["street_address", "postal_code", "phone", "website_url"]:
+            df[col] = None
+        df["brewery_type"] = "microbrewery"
+        df["longitude"] = 1.0
+        df["latitude"] = 1.0
+    with duckdb.connect(str(db_path), read_only=False) as con:
+        con.register("obdb_df", obdb)
+        con.register("ba_df", ba)
+        con.execute("CREATE OR REPLACE TABLE dim_breweries AS SELECT * FROM obdb_df")
+        con.execute("CREATE OR REPLACE TABLE stg_ba_breweries AS SELECT * FROM ba_df")
+
+
+OBDB = [
+    ("o1", "Alpha Brewing", "San Diego", "California", "United States"),
+    ("o2", "Beta Beer Co", "Portland", "Oregon", "United States"),
+    ("o3", "Gamma Ales", "Toronto", "Ontario", "Canada"),
+]
+BA = [
+    ("b1", "Alpha Brewing", "San Diego", "California", "United States"),
+    ("b2", "Beta Beer Co.", "Portland", "Oregon", "United States"),
+    ("b3", "Delta Taps", "Austin", "Texas", "United States"),
+]
+
+
+def test_partitioned_matching_matches_and_combines(tmp_path):
+    db_path = tmp_path / "obdb.duckdb"
+    _seed(db_path, OBDB, BA)
+
+    metrics = matching.run_partitioned_matching(db_path, parallelism=2)
+
+    assert metrics["partitions_total"] == 4
+    assert metrics["partitions_recomputed"] == 4
+    assert set(metrics["partition_seconds"]) == {
+        "california",
+        "oregon",
+        "ontario",
+        "texas",
+    }
+    with duckdb.connect(str(db_path), read_only=True) as con:
+        matches = con.sql(
+            f"""
+            SELECT brewery_id, ba_brewery_id, match_strategy
+            FROM {matching.MATCHES_TABLE} ORDER BY brewery_id
+            """
+        ).fetchall()
+        statuses = dict(
+            con.sql(
+                f"SELECT brewery_id, source_status FROM {matching.COMBINED_TABLE}"
+            ).fetchall()
+        )
+    assert matches == [
+        ("o1", "b1", "exact_name_state"),
+        ("o2", "b2", "fuzzy_name_city"),
+    ]
+    assert statuses == {
+        "o1": "matched",
+        "o2": "matched",
+        "o3": "obdb_only",
+        "b3": "ba_only",
+    }
+
+
+def test_partitioned_matching_only_recomputes_changed(tmp_path):
+    db_path = tmp_path / "obdb.duckdb"
+    _seed(db_path, OBDB, BA)
+    matching.run_partitioned_matching(db_path)
+
+    unchanged = matching.run_partitioned_matching(db_path)
+    assert unchanged["partitions_recomputed"] == 0
+    assert unchanged["match_rows"] == 2
+
+    # Drop Texas and rename the Oregon BA record so it no longer matches
+    ba = [BA[0], ("b2", "Zeta Cellars", "Portland", "Oregon", "United States")]
+    _seed(db_path, OBDB, ba)
+    changed = matching.run_partitioned_matching(db_path)
+
+    assert set(changed["partition_seconds"]) == {"oregon"}
+    assert changed["partitions_removed"] == 1
+    assert changed["match_rows"] == 1
+    assert changed["combined_rows"] == 4
+
+
+def test_match_cache_scores_only_new_records(tmp_path):
+    db_path = tmp_path / "obdb.duckdb"
+    _seed(db_path, OBDB, BA)
+
+    first = matching.run_partitioned_matching(db_path)
+    assert first["cache_hits"] == 0
+    assert first["cache_misses"] == 2
+    assert first["cache_hit_rate"] == 0.0
+
+    # A second San Diego brewery only needs scoring against existing keys
+    obdb = OBDB + [
+        ("o4", "Alpha Brewing Co", "San Diego", "California", "United States")
+    ]
+    _seed(db_path, obdb, BA)
+    second = matching.run_partitioned_matching(db_path)
+
+    assert set(second["partition_seconds"]) == {"california"}
+    assert second["cache_hits"] == 1
+    assert second["cache_misses"] == 1
+    assert second["cache_hit_rate"] == 0.5
+    # o4 is a fuzzy candidate for b1, but b1 already has an exact match
+    assert second["match_rows"] == 2
+
+
+def test_match_cache_invalidated_by_rules_version(tmp_path, monkeypatch):
+    db_path = tmp_path / "obdb.duckdb"
+    _seed(db_path, OBDB, BA)
+    matching.run_partitioned_matching(db_path)
+
+    monkeypatch.setattr(matching, "MATCHING_RULES_VERSION", "test-next")
+    rerun = matching.run_partitioned_matching(db_path)
+
+    assert rerun["partitions_recomputed"] == 4
+    assert rerun["cache_hits"] == 0
+    assert rerun["match_rows"] == 2
+    with duckdb.connect(str(db_path), read_only=True) as con:
+        versions = con.sql(
+            f"SELECT DISTINCT rules_version FROM {matching.CACHE_TABLE}"
+        ).fetchall()
+    assert versions == [("test-next",)]
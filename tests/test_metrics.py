@@ -0,0 +1,250 @@
+import json
+import sqlite3
+import time
+import urllib.request
+from datetime import datetime, timedelta, timezone
+
+import duckdb
+import pytest
+
+from extract import ingest_log, metrics
+from extract.config import load_settings
+
+
+def _settings(monkeypatch, tmp_path):
+    monkeypatch.setenv("OBDB_DUCKDB_PATH", str(tmp_path / "obdb.duckdb"))
+    monkeypatch.setenv("OBDB_SNAPSHOT_DIR", str(tmp_path / "snapshots"))
+    monkeypatch.setenv("OBDB_DBT_PROJECT_DIR", str(tmp_path / "dbt"))
+    (tmp_path / "dbt" / "models").mkdir(parents=True)
+    (tmp_path / "dbt" / "target").mkdir()
+    (tmp_path / "dbt" / "models" / "sources.yml").write_text(
+        """
+sources:
+  - name: raw
+    freshness:
+      warn_after: { count: 2, period: day }
+      error_after: { count: 3, period: day }
+    tables:
+      - name: raw_obdb_breweries
+      - name: raw_ba_json_data
+"""
+    )
+    return load_settings()
+
+
+def _log_run(settings, source, table, status, ts, **fields):
+    ingest_log.append_ingest_run(
+        settings.ingest_log_path,
+        {
+            "ts": ts.isoformat(timespec="microseconds"),
+            "source": source,
+            "table_name": table,
+            "status": status,
+            **fields,
+        },
+    )
+
+
+def test_registry_renders_openmetrics():
+    registry = metrics.MetricsRegistry()
+    registry.set("obdb_ingest_rows", 5, {"source": 'a"b', "table": "t"})
+    registry.set("obdb_dbt_run_elapsed_seconds", 1.5, {"stage": "base"})
+
+    text = registry.render()
+
+    assert "# TYPE obdb_ingest_rows gauge" in text
+    assert 'obdb_dbt_run_elapsed_seconds{stage="base"} 1.5' in text
+    assert 'obdb_ingest_rows{source="a\\"b",table="t"} 5' in text
+    assert text.endswith("# EOF\n")
+    with pytest.raises(KeyError):
+        registry.set("not_declared", 1)
+
+
+def test_parse_freshness_thresholds_per_table(tmp_path):
+    path = tmp_path / "sources.yml"
+    path.write_text(
+        """
+sources:
+  - name: raw
+    freshness:
+      warn_after: { count: 2, period: day }
+    tables:
+      - name: inherits
+      - name: overrides
+        freshness:
+          error_after: { count: 6, period: hour }
+      - name: disabled
+        freshness: null
+  - name: other
+    tables:
+      - name: unmonitored
+      - name: own
+        config:
+          freshness:
+            warn_after: { count: 30, period: minute }
+"""
+    )
+    assert metrics.parse_freshness_thresholds(path) == {
+        "inherits": {"warn_after": 172800},
+        "overrides": {"error_after": 21600},
+        "own": {"warn_after": 1800},
+    }
+    assert metrics.freshness_status(3 * 86400, {"warn_after": 172800}) == 1
+
+
+def test_collect_metrics_from_ingest_runs_and_dbt(monkeypatch, tmp_path):
+    settings = _settings(monkeypatch, tmp_path)
+    now = datetime(2025, 9, 10, tzinfo=timezone.utc)
+    # Aged so the success breaches error_after (3 days)
+    _log_run(
+        settings,
+        "obdb_csv",
+        settings.obdb_table,
+        "success",
+        now - timedelta(days=4),
+        row_count=7,
+        metrics_json=json.dumps({"row_count": 7, "bytes_fetched": 2048}),
+        duration_seconds=1.5,
+    )
+    target = settings.dbt_project_dir / "target"
+    (target / "run_results_base.json").write_text(
+        json.dumps(
+            {
+                "metadata": {"generated_at": "2025-09-10T00:00:00Z"},
+                "elapsed_time": 3.25,
+                "results": [
+                    {
+                        "unique_id": "model.brewery_models.dim_breweries",
+                        "status": "success",
+                        "execution_time": 0.75,
+                    }
+                ],
+            }
+        )
+    )
+    # The last invocation in the DAG is `dbt test`; its results are ignored
+    (target / "run_results.json").write_text(
+        json.dumps(
+            {
+                "elapsed_time": 9.0,
+                "results": [
+                    {
+                        "unique_id": "test.brewery_models.not_null_id",
+                        "status": "pass",
+                        "execution_time": 0.5,
+                    }
+                ],
+            }
+        )
+    )
+
+    text = metrics.collect_metrics(settings, now=now.timestamp()).render()
+
+    labels = '{source="obdb_csv",table="raw_obdb_breweries"}'
+    assert f"obdb_ingest_rows{labels} 7" in text
+    assert f"obdb_ingest_bytes_fetched{labels} 2048" in text
+    assert f"obdb_ingest_duration_seconds{labels} 1.5" in text
+    assert f"obdb_source_freshness_age_seconds{labels} 345600" in text
+    assert f"obdb_source_freshness_status{labels} 2" in text
+    assert (
+        'obdb_dbt_model_duration_seconds{model="model.brewery_models.dim_breweries",'
+        'stage="base",status="success"} 0.75'
+    ) in text
+    assert 'obdb_dbt_run_elapsed_seconds{stage="base"} 3.25' in text
+    assert "test.brewery_models" not in text
+    assert "obdb_metrics_collect_duration_seconds" in text
+
+
+def test_collect_metrics_sees_failures_without_opening_duckdb(monkeypatch, tmp_path):
+    settings = _settings(monkeypatch, tmp_path)
+    now = datetime.now(timezone.utc)
+    _log_run(settings, "obdb_csv", settings.obdb_table, "success", now)
+    _log_run(settings, "obdb_csv", settings.obdb_table, "failed", now, note="503")
+
+    def no_duckdb(*args, **kwargs):
+        raise AssertionError("scrapes must not lock a DuckDB file")
+
+    monkeypatch.setattr(duckdb, "connect", no_duckdb)
+    text = metrics.collect_metrics(settings).render()
+
+    labels = '{source="obdb_csv",table="raw_obdb_breweries"}'
+    assert f"obdb_ingest_success{labels} 0" in text
+
+
+def test_freshness_survives_long_failure_streak(monkeypatch, tmp_path):
+    settings = _settings(monkeypatch, tmp_path)
+    now = datetime(2025, 9, 10, tzinfo=timezone.utc)
+    _log_run(
+        settings, "ba_json", settings.ba_table, "success", now - timedelta(hours=80)
+    )
+    # Far more failed runs than any recent-rows window would cover
+    for hour in range(79, 0, -1):
+        for source in ("obdb_csv", "ba_json", "match_partitions"):
+            ts = now - timedelta(hours=hour)
+            _log_run(settings, source, settings.ba_table, "failed", ts)
+
+    text = metrics.collect_metrics(settings, now=now.timestamp()).render()
+
+    labels = '{source="ba_json",table="raw_ba_json_data"}'
+    assert f"obdb_source_freshness_age_seconds{labels} 288000" in text
+    assert f"obdb_source_freshness_status{labels} 2" in text
+
+
+def test_collect_metrics_without_ingest_log(monkeypatch, tmp_path):
+    settings = _settings(monkeypatch, tmp_path)
+
+    text = metrics.collect_metrics(settings).render()
+
+    assert "obdb_ingest_rows{" not in text
+    assert "obdb_metrics_collect_duration_seconds" in text
+
+
+def test_serve_metrics_endpoint_can_be_scraped():
+    registry = metrics.MetricsRegistry()
+    registry.set("obdb_dbt_run_elapsed_seconds", 1.25)
+    server = metrics.serve_metrics(lambda: registry, port=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/metrics"
+        with urllib.request.urlopen(url) as resp:
+            content_type = resp.headers["Content-Type"]
+            body = resp.read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert content_type.startswith("application/openmetrics-text")
+    assert "obdb_dbt_run_elapsed_seconds 1.25" in body
+
+
+def test_collect_metrics_overhead(monkeypatch, tmp_path):
+    # Generous bound for the per-scrape cost quoted in the README; typical
+    # figures are tens of milliseconds.
+    settings = _settings(monkeypatch, tmp_path)
+    # About a year of hourly DAG runs, bulk-inserted after creating the log
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    _log_run(settings, "obdb_csv", settings.obdb_table, "success", start)
+    rows = [
+        (
+            (start + timedelta(hours=hour)).isoformat(timespec="microseconds"),
+            source,
+            table,
+            "failed" if hour % 50 == 0 else "success",
+        )
+        for hour in range(1, 24 * 365)
+        for source, table in (
+            ("obdb_csv", settings.obdb_table),
+            ("ba_json", settings.ba_table),
+        )
+    ]
+    with sqlite3.connect(settings.ingest_log_path) as con:
+        con.executemany(
+            "INSERT INTO ingest_runs (ts, source, table_name, status) "
+            "VALUES (?, ?, ?, ?)",
+            rows,
+        )
+    scrapes = 10
+    started = time.perf_counter()
+    for _ in range(scrapes):
+        metrics.collect_metrics(settings)
+    per_scrape = (time.perf_counter() - started) / scrapes
+
+    assert per_scrape < 0.5
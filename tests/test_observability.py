@@ -0,0 +1,56 @@
+import io
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from extract import observability
+
+
+def test_record_span_writes_otlp_json(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    start = datetime(2025, 9, 10, tzinfo=timezone.utc)
+    for task_id in ["load_obdb_data", "dbt_run"]:
+        observability.record_span(
+            path, task_id, "manual__run", start, start + timedelta(seconds=2)
+        )
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    spans = [line["resourceSpans"][0]["scopeSpans"][0]["spans"][0] for line in lines]
+    assert [s["name"] for s in spans] == ["load_obdb_data", "dbt_run"]
+    assert spans[0]["traceId"] == spans[1]["traceId"]
+    assert int(spans[0]["endTimeUnixNano"]) - int(spans[0]["startTimeUnixNano"]) == (
+        2_000_000_000
+    )
+
+
+def test_json_formatter_includes_fields():
+    record = logging.LogRecord("obdb_etl", logging.INFO, "", 0, "fetch", None, None)
+    record.fields = {"bytes": 3}
+    payload = json.loads(observability.JsonFormatter().format(record))
+    assert payload["event"] == "fetch"
+    assert payload["level"] == "info"
+    assert payload["bytes"] == 3
+
+
+def test_fetched_bytes_accumulates_across_hosts():
+    before = observability.fetched_bytes()
+    observability.record_fetch("https://a.example.com/x.csv", 100, 0.1)
+    observability.record_fetch("https://b.example.com/y.json", 50, 0.1)
+    assert observability.fetched_bytes() - before == 150
+
+
+def test_log_event_overhead(monkeypatch):
+    # Generous bound for the per-event cost quoted in the README; typical
+    # figures are tens of microseconds.
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(observability.JsonFormatter())
+    monkeypatch.setattr(observability.get_logger(), "handlers", [handler])
+    events = 2000
+    started = time.perf_counter()
+    for i in range(events):
+        observability.log_event("fetch", host="example.com", bytes=i)
+    per_event = (time.perf_counter() - started) / events
+    assert len(stream.getvalue().splitlines()) == events
+    assert per_event < 0.0005
@@ -0,0 +1,56 @@
+import duckdb
+
+from extract import snapshots
+
+
+def _make_db(path, value):
+    with duckdb.connect(str(path), read_only=False) as con:
+        con.execute("CREATE OR REPLACE TABLE t AS SELECT ? AS v", [value])
+
+
+def test_publish_snapshot_sets_current_and_is_readable(tmp_path):
+    db_path = tmp_path / "obdb.duckdb"
+    snapshot_dir = tmp_path / "snapshots"
+    _make_db(db_path, 1)
+
+    published = snapshots.publish_snapshot(db_path, snapshot_dir)
+
+    assert snapshots.current_snapshot(snapshot_dir) == published
+    assert snapshots.resolve_read_path(db_path, snapshot_dir) == published
+    # Writer keeps working on the staging file while the snapshot is open
+    with duckdb.connect(str(published), read_only=True) as reader:
+        _make_db(db_path, 2)
+        row = reader.sql("SELECT v FROM t").fetchone()
+    assert row == (1,)
+
+
+def test_resolve_read_path_falls_back_to_working_db(tmp_path):
+    db_path = tmp_path / "obdb.duckdb"
+    assert snapshots.resolve_read_path(db_path, tmp_path / "missing") == db_path
+
+
+def test_publish_snapshot_prunes_to_retain(tmp_path):
+    db_path = tmp_path / "obdb.duckdb"
+    snapshot_dir = tmp_path / "snapshots"
+    published = []
+    for i in range(4):
+        _make_db(db_path, i)
+        published.append(snapshots.publish_snapshot(db_path, snapshot_dir, retain=2))
+
+    remaining = snapshots.list_snapshots(snapshot_dir)
+    assert remaining == [published[3], published[2]]
+    with duckdb.connect(
+        str(snapshots.resolve_read_path(db_path, snapshot_dir)), read_only=True
+    ) as con:
+        assert con.sql("SELECT v FROM t").fetchone() == (3,)
+
+
+def test_prune_keeps_previous_snapshot_even_with_retain_one(tmp_path):
+    db_path = tmp_path / "obdb.duckdb"
+    snapshot_dir = tmp_path / "snapshots"
+    published = []
+    for i in range(3):
+        _make_db(db_path, i)
+        published.append(snapshots.publish_snapshot(db_path, snapshot_dir, retain=1))
+
+    assert snapshots.list_snapshots(snapshot_dir) == [published[2], published[1]]